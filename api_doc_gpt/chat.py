@@ -2,6 +2,8 @@ import logging
 
 import openai
 
+from api_doc_gpt.scheduler import Priority, RequestScheduler, estimate_tokens, get_default_scheduler
+
 logger = logging.getLogger(__name__)
 
 class Chat:
@@ -12,6 +14,8 @@ class Chat:
         starting_state: list[str] = None,
         model_name: str = "gpt-3.5-turbo",
         stop: list[str] | None = None,
+        priority: Priority = "interactive",
+        scheduler: RequestScheduler | None = None,
     ):
         if starting_state:
             self._messages = starting_state
@@ -23,6 +27,8 @@ class Chat:
         self.total_tokens = 0
         self.model_name = model_name
         self.stop = stop
+        self.priority = priority
+        self.scheduler = scheduler
         
     def _construct_request(self, messages):
         req = {
@@ -37,9 +43,11 @@ class Chat:
         }
         if self.stop:
             kwargs["stop"] = self.stop
-        return openai.ChatCompletion.create(
-            **args,
-            **kwargs
+        scheduler = self.scheduler or get_default_scheduler()
+        return scheduler.submit(
+            lambda: openai.ChatCompletion.create(**args, **kwargs),
+            estimated_tokens=estimate_tokens(args["messages"]),
+            priority=self.priority,
         )
     
     def user_message(self, text: str):
@@ -12,46 +12,64 @@ from api_doc_gpt.chat import Chat
 from api_doc_gpt.react.react_engine import ReactEngine
 from api_doc_gpt.react.tools import GetEndpointDetails, RequestTool
 from api_doc_gpt.naive.naive_agent import NaiveAgent
+from api_doc_gpt.openapi_parser import OpenApiParser
+from api_doc_gpt.request_validator import RequestValidator
+from api_doc_gpt.scheduler import DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_TOKENS_PER_MINUTE, Priority, RequestScheduler, set_default_scheduler
+from api_doc_gpt.spec_index import SpecIndex
+
+
+def get_openapi_from_fastapi(target_app_path: str) -> dict:
+    package_path, module_name = target_app_path.split(":")
+    fastapi_module = importlib.import_module(package_path, module_name)
+    app: FastAPI = getattr(fastapi_module, module_name)
+    openapi_docs = get_openapi(
+        title=app.title,
+        version=app.version,
+        openapi_version=app.openapi_version,
+        description=app.description,
+        routes=app.routes,
+    )
+    return openapi_docs
+
+
+def get_openapi_from_path(path: str) -> dict:
+    # check if path is URL or file path
+    if path.startswith("http"):
+        openapi_docs = requests.get(path).json()
+    else:
+        with open(path, "r") as f:
+            openapi_docs = json.load(f)
+    return openapi_docs
+
+
+def load_openapi(target_app: str | None = None, openapi_json_path: str | None = None) -> dict:
+    if openapi_json_path:
+        return get_openapi_from_path(openapi_json_path)
+    if target_app:
+        return get_openapi_from_fastapi(target_app)
+    raise ValueError("Either a target app or an openapi json path is required.")
 
 
 class ApiMasterAI:
     chat: Chat
 
-    def __init__(self, target_app: str, base_url: str, openapi_json_path: str, model_name: str, agent: Literal["naive", "react"] = "naive"):
+    def __init__(self, target_app: str, base_url: str, openapi_json_path: str, model_name: str, agent: Literal["naive", "react"] = "naive", spec_index_path: str | None = None, priority: Priority = "interactive"):
         self.target_app_path = target_app
         self.base_url = base_url
         self.openapi_json_path = openapi_json_path
         self.model_name = model_name
         self.agent = agent
+        self.spec_index_path = spec_index_path
+        self.priority = priority
     
     def _get_openapi(self) -> dict:
-        if self.openapi_json_path:
-            openapi_docs = self.get_openapi_from_path(self.openapi_json_path)
-        elif self.target_app_path:
-            openapi_docs = self.get_openapi_from_fastapi(self.target_app_path)
-        return openapi_docs
+        return load_openapi(target_app=self.target_app_path, openapi_json_path=self.openapi_json_path)
     
     def get_openapi_from_fastapi(self, target_app_path: str):
-        package_path, module_name = target_app_path.split(":")
-        fastapi_module = importlib.import_module(package_path, module_name)
-        app: FastAPI = getattr(fastapi_module, module_name)
-        openapi_docs = get_openapi(
-            title=app.title,
-            version=app.version,
-            openapi_version=app.openapi_version,
-            description=app.description,
-            routes=app.routes,
-        )
-        return openapi_docs
+        return get_openapi_from_fastapi(target_app_path)
     
     def get_openapi_from_path(self, path: str):
-        # check if path is URL or file path
-        if path.startswith("http"):
-            openapi_docs = requests.get(path).json()
-        else:
-            with open(path, "r") as f:
-                openapi_docs = json.load(f)
-        return openapi_docs
+        return get_openapi_from_path(path)
 
     def start(self):
         if self.agent == "naive":
@@ -61,15 +79,27 @@ class ApiMasterAI:
         else:
             raise ValueError(f"Method '{self.agent}' is not supported.")
     
+    def _get_spec_index(self) -> SpecIndex | None:
+        if self.spec_index_path:
+            return SpecIndex.attach(self.spec_index_path)
+        return None
+
     def start_naive(self):
-        openapi = self._get_openapi()
-        naive_engine = NaiveAgent(base_url=self.base_url, model_name=self.model_name, openapi_json=openapi)
+        spec_index = self._get_spec_index()
+        openapi = None if spec_index else self._get_openapi()
+        naive_engine = NaiveAgent(base_url=self.base_url, model_name=self.model_name, openapi_json=openapi, spec_index=spec_index, priority=self.priority)
         naive_engine.start()
         self.engine = naive_engine
 
     def start_react(self):
-        openapi = self._get_openapi()
-        react_engine = ReactEngine(tools=[GetEndpointDetails(openapi_json=openapi), RequestTool()], openapi_json=openapi, base_url=self.base_url)
+        spec_index = self._get_spec_index()
+        openapi = None if spec_index else self._get_openapi()
+        if spec_index:
+            validator = spec_index.request_validator()
+        else:
+            validator = RequestValidator.from_openapi_parts(OpenApiParser(openapi).parse())
+        tools = [GetEndpointDetails(openapi_json=openapi, spec_index=spec_index), RequestTool(validator=validator, base_url=self.base_url)]
+        react_engine = ReactEngine(tools=tools, openapi_json=openapi, base_url=self.base_url, spec_index=spec_index, priority=self.priority)
         self.engine = react_engine
 
     def q(self, question):
@@ -83,7 +113,12 @@ def start_api_master(
         base_url="http://0.0.0.0:8000",
         verbose: bool = False,
         model_name: str = "gpt-3.5-turbo",
-        agent: Literal["naive", "react"] = "react"
+        agent: Literal["naive", "react"] = "react",
+        spec_index: str | None = None,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        workers: int = 1,
+        priority: Priority = "interactive"
     ) -> callable:
     if verbose:
         logging.basicConfig(level=logging.DEBUG)
@@ -91,7 +126,9 @@ def start_api_master(
         logging.basicConfig(level=logging.ERROR)
 
     openai.api_key = openai_key
-    api_master_ai = ApiMasterAI(target_app=target_app, base_url=base_url, openapi_json_path=openapi_json, model_name=model_name, agent=agent)
+    rate_limits = get_worker_rate_limits(requests_per_minute, tokens_per_minute, workers, spec_index_path=spec_index)
+    set_default_scheduler(RequestScheduler(**rate_limits))
+    api_master_ai = ApiMasterAI(target_app=target_app, base_url=base_url, openapi_json_path=openapi_json, model_name=model_name, agent=agent, spec_index_path=spec_index, priority=priority)
     api_master_ai.start()
     q = api_master_ai.q
 
@@ -99,3 +136,42 @@ def start_api_master(
         inp = input(">>> ")
         if inp == "exit": break
         print(q(inp))
+
+
+def get_worker_rate_limits(
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        workers: int = 1,
+        spec_index_path: str | None = None
+    ) -> dict:
+    """
+    Rate limits for this process. The scheduler only sees its own process, so
+    the account limits are split evenly across `workers`. Without explicit
+    limits, a worker attached to a spec index uses the share its parent stored.
+    """
+    if spec_index_path and requests_per_minute is None and tokens_per_minute is None:
+        with SpecIndex.attach(spec_index_path) as spec_index:
+            if rate_limits := spec_index.rate_limits():
+                return rate_limits
+    return {
+        "requests_per_minute": (requests_per_minute or DEFAULT_REQUESTS_PER_MINUTE) / workers,
+        "tokens_per_minute": (tokens_per_minute or DEFAULT_TOKENS_PER_MINUTE) / workers,
+    }
+
+
+def build_spec_index(
+        target_app: str | None = None,
+        openapi_json: str | None = None,
+        output: str | None = None,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        workers: int = 1
+    ) -> SpecIndex:
+    """
+    Builds the shared spec index in the calling process, which owns the file:
+    use the result as a context manager, or call `unlink()`, once the workers
+    are done, otherwise the file stays in /dev/shm. Each of the `workers`
+    attached to it gets an even share of the account rate limits.
+    """
+    rate_limits = get_worker_rate_limits(requests_per_minute, tokens_per_minute, workers)
+    return SpecIndex.build(load_openapi(target_app=target_app, openapi_json_path=openapi_json), path=output, rate_limits=rate_limits)
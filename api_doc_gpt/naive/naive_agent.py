@@ -2,55 +2,53 @@ import json
 import os
 from api_doc_gpt.engine import Engine
 
-from api_doc_gpt.openapi_parser import OpenApiParser, OpenApiParts
+from api_doc_gpt.openapi_parser import OpenApiParser
 from api_doc_gpt.chat import Chat
 from api_doc_gpt.naive.processing_engine import ProcessingEngine
+from api_doc_gpt.request_validator import RequestValidator
+from api_doc_gpt.scheduler import Priority
+from api_doc_gpt.spec_index import SpecIndex, TABLE_NAMES
 
 
 class NaiveAgent(Engine):
     chat: Chat
     engine: ProcessingEngine
 
-    def __init__(self, base_url: str, openapi_json: dict, model_name: str):
+    def __init__(self, base_url: str, openapi_json: dict | None, model_name: str, spec_index: SpecIndex | None = None, priority: Priority = "interactive"):
         self.base_url = base_url
         self.model_name = model_name
         self.openapi_json = openapi_json
+        self.spec_index = spec_index
+        self.priority = priority
 
     def start(self):
-        openapi = self.openapi_json
-        openapi_parts = OpenApiParser(openapi).parse()
-
-        system_prompt = self.get_system_prompt(openapi_parts)
+        if self.spec_index:
+            tables = {name: self.spec_index.table_csv(name) for name in TABLE_NAMES}
+            validator = self.spec_index.request_validator()
+        else:
+            openapi_parts = OpenApiParser(self.openapi_json).parse()
+            tables = {name: getattr(openapi_parts, name).to_csv() for name in TABLE_NAMES}
+            validator = RequestValidator.from_openapi_parts(openapi_parts)
+
+        system_prompt = self.get_system_prompt(tables)
         start_prompt = self.get_start_prompt()
 
         starting_state = [
             {"role": "system", "content": system_prompt},
             *start_prompt
         ]
-        chat = Chat(starting_state=starting_state, model_name=self.model_name)
-        engine = ProcessingEngine(chat=chat, base_url=self.base_url)
+        chat = Chat(starting_state=starting_state, model_name=self.model_name, priority=self.priority)
+        engine = ProcessingEngine(chat=chat, base_url=self.base_url, validator=validator)
         self.chat = chat
         self.engine = engine
 
-    def get_system_prompt(self, openapi_parts: OpenApiParts) -> str:
-        method_definitions = openapi_parts.method_definitions.to_csv()
-        schema_definitions = openapi_parts.schema_definitions.to_csv()
-        parameter_definitions = openapi_parts.parameter_definitions.to_csv()
-        request_body_definitions = openapi_parts.request_body_definitions.to_csv()
-        security_definitions = openapi_parts.security_definitions.to_csv()
-
+    def get_system_prompt(self, tables: dict[str, str]) -> str:
         system_prompt = ""
         dirname = os.path.dirname(__file__)
         with open(dirname + "/../assets/system_prompt.txt", "r") as f:
             system_prompt = f.read()
 
-        system_prompt = system_prompt.format(
-            method_definitions = method_definitions,
-            parameter_definitions = parameter_definitions,
-            request_body_definitions = request_body_definitions,
-            schema_definitions = schema_definitions,
-            security_definitions = security_definitions
-        )
+        system_prompt = system_prompt.format(**tables)
         return system_prompt
 
     def get_start_prompt(self) -> dict:
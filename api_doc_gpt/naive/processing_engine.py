@@ -4,13 +4,15 @@ import logging
 import requests
 
 from api_doc_gpt.chat import Chat
+from api_doc_gpt.request_validator import RequestValidator
 
 logger = logging.getLogger(__name__)
 
 class ProcessingEngine:
-    def __init__(self, chat: Chat, base_url = "http://0.0.0.0:8000"):
+    def __init__(self, chat: Chat, base_url = "http://0.0.0.0:8000", validator: RequestValidator | None = None):
         self.chat = chat
         self.base_url = base_url
+        self.validator = validator
         
     def ask(self, question) -> str:
         response: str = self.chat.user_message(f"PROMPT: {question}")
@@ -42,7 +44,10 @@ class ProcessingEngine:
             for part in command_parts:
                 if "REQ_BODY" in part:
                     body_str = part.split("REQ_BODY ")[1]
-                    body = json.loads(body_str)
+                    try:
+                        body = json.loads(body_str)
+                    except json.JSONDecodeError as e:
+                        return self.cmd_resp(f"Request was not sent. REQ_BODY is not valid JSON: {e}")
                     break
 
         if "HEADER" in command:
@@ -56,6 +61,11 @@ class ProcessingEngine:
                     finally:
                         break
 
+        if self.validator:
+            if errors := self.validator.validate(method, path, body, headers=headers):
+                logger.debug(f"Request failed validation: {errors}")
+                return self.cmd_resp(f"Request was not sent, it does not match the API documentation: {'; '.join(errors)}")
+
         response = self.send_request(method, path, body, headers=headers)
         return self.cmd_resp(response)
    
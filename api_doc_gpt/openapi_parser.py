@@ -79,6 +79,7 @@ class OpenApiRequestBodyDefinition(OpenApiGeneric):
     operation_id: str
     content_type: str
     schema_ref: str
+    required: bool
 
 class OpenApiRequestBodyDefinitionList(OpenApiGenericList):
     content: list[OpenApiRequestBodyDefinition]
@@ -101,6 +102,14 @@ class OpenApiSecurityDefinition(OpenApiGeneric):
 class OpenApiSecurityDefinitionList(OpenApiGenericList):
     content: list[OpenApiSecurityDefinition]
 
+
+def search_in_openapi_parts(openapi_part: OpenApiGenericList, key, value) -> OpenApiGeneric | None:
+    for item in openapi_part.content:
+        if getattr(item, key) == value:
+            return item
+    return None
+
+
 @dataclass
 class OpenApiParts:
     method_definitions: OpenApiMethodDefinitionList
@@ -170,7 +179,8 @@ class OpenApiParser:
                         request_body_list.append({
                             "operation_id": operation_id,
                             "content_type": content_type,
-                            "schema_ref": schema.get("schema").get("$ref", "").replace(schema_prefix, "")
+                            "schema_ref": schema.get("schema").get("$ref", "").replace(schema_prefix, ""),
+                            "required": request_body.get("required", False)
                         })
                 method_definition_data.append({
                     "operation_id": operation_id,
@@ -217,3 +227,30 @@ class OpenApiParser:
 
         self.openapi_parts.schema_definitions = OpenApiSchemaDefinitionList([OpenApiSchemaDefinition(**d) for d in schema_data])
         self.openapi_parts.security_definitions = OpenApiSecurityDefinitionList([OpenApiSecurityDefinition(**d) for d in security_data])
+
+
+def get_endpoint_details(openapi_parts: OpenApiParts, endpoint_id: str) -> dict:
+    endpoint_definition = search_in_openapi_parts(openapi_parts.method_definitions, "operation_id", endpoint_id)
+    if not endpoint_definition:
+        raise ValueError(f"Endpoint {endpoint_id} not found")
+
+    endpoint_parameters_part = search_in_openapi_parts(openapi_parts.parameter_definitions, "operation_id", endpoint_id)
+    request_body_part = search_in_openapi_parts(openapi_parts.request_body_definitions, "operation_id", endpoint_id)
+    request_body_schema = None
+
+    security = endpoint_definition.security
+    security_details_part = search_in_openapi_parts(openapi_parts.security_definitions, "security_name", security)
+
+    if request_body_part:
+        request_body_ref = request_body_part.schema_ref
+        request_body_schema = []
+        for schema in openapi_parts.schema_definitions.content:
+            if schema.schema_name == request_body_ref:
+                request_body_schema.append(schema)
+
+    return {
+        "endpoint_parameters": endpoint_parameters_part,
+        "request_body_schema": request_body_schema,
+        "endpoint_definition": endpoint_definition,
+        "security_details": security_details_part,
+    }
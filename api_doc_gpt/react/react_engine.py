@@ -6,21 +6,25 @@ from api_doc_gpt.chat import Chat
 from api_doc_gpt.engine import Engine
 from api_doc_gpt.openapi_parser import OpenApiGeneric, OpenApiParser, OpenApiGenericList
 from api_doc_gpt.react.tools import Tool, RequestTool, GetEndpointDetails
+from api_doc_gpt.scheduler import Priority
+from api_doc_gpt.spec_index import SpecIndex
 
 dirname = os.path.dirname(__file__)
 logger = logging.getLogger(__name__)
 
 
 class ReactEngine(Engine):
-    def __init__(self, tools: list[Tool], openapi_json: dict, base_url: str) -> None:
+    def __init__(self, tools: list[Tool], openapi_json: dict | None, base_url: str, spec_index: SpecIndex | None = None, priority: Priority = "interactive") -> None:
         self.tools = tools
         self.openapi_json = openapi_json
+        self.spec_index = spec_index
+        self.priority = priority
         self.base_url = base_url
         self.chat = self._get_chat()
 
     def _get_chat(self):
         system_prompt = self.get_system_prompt()
-        chat = Chat(system_message=system_prompt, stop=["\nObservation:", "\n\tObservation:"])
+        chat = Chat(system_message=system_prompt, stop=["\nObservation:", "\n\tObservation:"], priority=self.priority)
         return chat
 
     def get_system_prompt(self) -> str:
@@ -30,13 +34,16 @@ class ReactEngine(Engine):
         with open(dirname + "/../assets/react.prompt", "r") as f:
             system_prompt = f.read()
 
-        parser = OpenApiParser(openapi_json=self.openapi_json)
-        openapi_parts = parser.parse()
+        if self.spec_index:
+            method_list = self.spec_index.table_csv("method_definitions")
+        else:
+            parser = OpenApiParser(openapi_json=self.openapi_json)
+            method_list = parser.parse().method_definitions.to_csv()
 
         system_prompt = system_prompt.format(
             tool_descriptions="\n".join([f"- {tool.name}: {tool.description}" for tool in tools]),
             tool_name_list=", ".join([f"{tool.name}" for tool in tools]),
-            method_list=openapi_parts.method_definitions.to_csv(),
+            method_list=method_list,
             base_url=self.base_url
         )
         return system_prompt
@@ -1,18 +1,14 @@
+import json
 import logging
 
 import requests
 
-from api_doc_gpt.openapi_parser import OpenApiGeneric, OpenApiParser, OpenApiGenericList
+from api_doc_gpt.openapi_parser import OpenApiGeneric, OpenApiParser, OpenApiGenericList, get_endpoint_details
+from api_doc_gpt.request_validator import RequestValidator
+from api_doc_gpt.spec_index import SpecIndex
 
 logger = logging.getLogger(__name__)
 
-def search_in_openapi_parts(openapi_part: OpenApiGenericList, key, value) -> OpenApiGeneric | None:
-    for item in openapi_part.content:
-        if getattr(item, key) == value:
-            return item
-    return None
-
-
 class Tool:
     def __init__(self, name: str, description: str):
         self.name = name
@@ -22,44 +18,26 @@ class Tool:
         raise NotImplementedError
     
 class GetEndpointDetails(Tool):
-    def __init__(self, openapi_json: dict):
+    def __init__(self, openapi_json: dict | None = None, spec_index: SpecIndex | None = None):
         self.openapi_json = openapi_json
+        self.spec_index = spec_index
         super().__init__(
             name="EndpointDetails",
             description="Use this for getting details about an OpenAPI endpoint. You should use this tool to know which body or other parameters you need to use for request. Always use this tool before sending any requests. Input should be operation_id. Always start with this before doing anything else.",
         )
 
     def __call__(self, endpoint_id: str) -> any:
+        if self.spec_index:
+            return self.spec_index.endpoint_details(endpoint_id)
+
         parser = OpenApiParser(openapi_json=self.openapi_json)
         openapi_parts = parser.parse()
-
-        endpoint_definition = search_in_openapi_parts(openapi_parts.method_definitions, "operation_id", endpoint_id)
-        if not endpoint_definition:
-            raise ValueError(f"Endpoint {endpoint_id} not found")
-
-        endpoint_parameters_part = search_in_openapi_parts(openapi_parts.parameter_definitions, "operation_id", endpoint_id)
-        request_body_part = search_in_openapi_parts(openapi_parts.request_body_definitions, "operation_id", endpoint_id)
-        request_body_schema = None
-
-        security = endpoint_definition.security
-        security_details_part = search_in_openapi_parts(openapi_parts.security_definitions, "security_name", security)
-
-        if request_body_part:
-            request_body_ref = request_body_part.schema_ref
-            request_body_schema = []
-            for schema in openapi_parts.schema_definitions.content:
-                if schema.schema_name == request_body_ref:
-                    request_body_schema.append(schema)
-
-        return {
-            "endpoint_parameters": endpoint_parameters_part,
-            "request_body_schema": request_body_schema,
-            "endpoint_definition": endpoint_definition,
-            "security_details": security_details_part,
-        }  
+        return get_endpoint_details(openapi_parts, endpoint_id)
 
 class RequestTool(Tool):
-    def __init__(self):
+    def __init__(self, validator: RequestValidator | None = None, base_url: str | None = None):
+        self.validator = validator
+        self.base_url = base_url
         super().__init__(
             name="Request",
             description="Use this for making a request to an API on user's behalf. Action Input must be a dict of arguments that can be passed to `requests.request` function.",
@@ -67,4 +45,33 @@ class RequestTool(Tool):
 
     def __call__(self, body) -> any:
         logger.debug(f"Making request with data: {body}")
-        return requests.request(**body).json()
\ No newline at end of file
+        if self.validator and self.base_url and isinstance(body, dict):
+            self.validate(body)
+        return requests.request(**body).json()
+
+    def validate(self, body: dict):
+        url = str(body.get("url", ""))
+        base_url = self.base_url.rstrip("/")
+        path = url[len(base_url):]
+        if not url.startswith(base_url) or (path and path[0] not in "/?"):
+            # not a call to the documented API
+            return
+
+        request_body = body.get("json")
+        # form data, raw bytes and files can't be checked against the JSON schema
+        check_body = body.get("files") is None
+        if request_body is None and body.get("data") is not None:
+            try:
+                request_body = json.loads(body["data"])
+            except (TypeError, json.JSONDecodeError):
+                check_body = False
+        errors = self.validator.validate(
+            str(body.get("method", "GET")),
+            path or "/",
+            request_body,
+            headers=body.get("headers"),
+            params=body.get("params") if isinstance(body.get("params"), dict) else None,
+            check_body=check_body,
+        )
+        if errors:
+            raise ValueError(f"Request was not sent, it does not match the API documentation: {'; '.join(errors)}")
\ No newline at end of file
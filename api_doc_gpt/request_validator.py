@@ -0,0 +1,301 @@
+import re
+import threading
+from typing import Callable
+from urllib.parse import parse_qs, urlsplit
+
+from api_doc_gpt.openapi_parser import OpenApiParts
+
+_TEMPLATE_PARAMETER = re.compile(r"\{([^}/]+)\}")
+_INTEGER = re.compile(r"-?\d+")
+_NUMBER = re.compile(r"-?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?")
+_BOOLEANS = {"true", "false", "1", "0"}
+
+
+def _text_checker(parameter_type: str | None) -> Callable[[str], bool]:
+    """
+    Checker for a path, query or header value, which always arrives as text.
+    """
+    if parameter_type and parameter_type.startswith("array[") and parameter_type.endswith("]"):
+        return _text_checker(parameter_type[len("array["):-1])
+    if parameter_type == "integer":
+        return lambda value: bool(_INTEGER.fullmatch(value))
+    if parameter_type == "number":
+        return lambda value: bool(_NUMBER.fullmatch(value))
+    if parameter_type == "boolean":
+        return lambda value: value.lower() in _BOOLEANS
+    return lambda value: True
+
+
+def _json_checker(variable_type: str | None) -> Callable[[any], bool]:
+    """
+    Checker for a decoded JSON body field.
+    """
+    if variable_type == "string":
+        return lambda value: isinstance(value, str)
+    if variable_type == "integer":
+        return lambda value: isinstance(value, int) and not isinstance(value, bool)
+    if variable_type == "number":
+        return lambda value: isinstance(value, (int, float)) and not isinstance(value, bool)
+    if variable_type == "boolean":
+        return lambda value: isinstance(value, bool)
+    if variable_type == "object":
+        return lambda value: isinstance(value, dict)
+    if variable_type:
+        # a schema name; the parser reports arrays of a schema by the item schema name
+        return lambda value: isinstance(value, (dict, list))
+    return lambda value: True
+
+
+def _split_path(path: str) -> list[str]:
+    path = path.strip("/")
+    return path.split("/") if path else []
+
+
+# guards the lazy expansion of route nodes, which requests on other threads may race
+_EXPAND_LOCK = threading.Lock()
+
+
+class _RouteNode:
+    """
+    One path segment in the route trie. Literal children are looked up
+    directly; only segments with template parameters are matched by regex.
+
+    Routes are kept unexpanded in `pending` until a lookup first reaches the
+    node, so a large spec costs one segment split per route at startup and
+    the rest of the trie is only built along the paths that are called.
+    """
+
+    def __init__(self) -> None:
+        self.literals: dict[str, "_RouteNode"] = {}
+        self.patterns: dict[str, tuple[re.Pattern, list[str], "_RouteNode"]] = {}
+        # method -> operation id
+        self.route: dict[str, str] | None = None
+        # (rest of the path below this node, method, operation id)
+        self.pending: list[tuple[str, str, str]] = []
+
+    def child(self, segment: str) -> "_RouteNode":
+        if segment in self.literals:
+            return self.literals[segment]
+        if segment in self.patterns:
+            return self.patterns[segment][2]
+        node = _RouteNode()
+        if not _TEMPLATE_PARAMETER.search(segment):
+            self.literals[segment] = node
+            return node
+        pattern = ""
+        position = 0
+        for match in _TEMPLATE_PARAMETER.finditer(segment):
+            pattern += re.escape(segment[position:match.start()]) + "([^/]+)"
+            position = match.end()
+        pattern += re.escape(segment[position:])
+        self.patterns[segment] = (re.compile(pattern), _TEMPLATE_PARAMETER.findall(segment), node)
+        return node
+
+    def expand(self) -> None:
+        with _EXPAND_LOCK:
+            for path, method, operation_id in self.pending:
+                if not path:
+                    if self.route is None:
+                        self.route = {}
+                    self.route.setdefault(method, operation_id)
+                    continue
+                segment, _, rest = path.partition("/")
+                self.child(segment).pending.append((rest, method, operation_id))
+            # cleared last, so other threads wait on the lock until the children are complete
+            self.pending = []
+
+    def find(self, segments: list[str], index: int = 0) -> tuple[dict[str, str], dict[str, str]] | None:
+        if self.pending:
+            self.expand()
+        if index == len(segments):
+            return (self.route, {}) if self.route else None
+        segment = segments[index]
+        # literal segments first, so /pet/findByStatus wins over /pet/{petId}
+        if (child := self.literals.get(segment)) and (found := child.find(segments, index + 1)):
+            return found
+        for regex, names, child in self.patterns.values():
+            if (match := regex.fullmatch(segment)) and (found := child.find(segments, index + 1)):
+                route, path_parameters = found
+                return route, {**dict(zip(names, match.groups())), **path_parameters}
+        return None
+
+
+class OperationValidator:
+    """
+    Checks a single call against one operation. Everything that does not
+    depend on the call, like the type checkers, is built once here.
+    """
+
+    def __init__(self, operation_id: str, method: str, path: str, parameters: list[dict], body_fields: list[dict] | None, body_required: bool = False) -> None:
+        self.operation_id = operation_id
+        self.method = method.upper()
+        self.path = path
+        self.parameters = parameters
+        self.body_fields = body_fields
+        self.body_required = body_required
+
+        self._parameter_rules = [
+            (parameter["name"], parameter["in"], bool(parameter["required"]), parameter["parameter_type"], _text_checker(parameter["parameter_type"]))
+            for parameter in parameters
+        ]
+        self._body_rules = None
+        if body_fields is not None:
+            self._body_rules = [
+                (field["variable_name"], bool(field["required"]), field["variable_type"], _json_checker(field["variable_type"]))
+                for field in body_fields
+            ]
+
+    def validate(self, path_parameters: dict[str, str], query: dict[str, list[str]], headers: dict | None, body: any, check_body: bool = True) -> list[str]:
+        errors = []
+        headers = {key.lower(): str(value) for key, value in (headers or {}).items()}
+
+        for name, location, required, parameter_type, checker in self._parameter_rules:
+            if location == "path":
+                values = [path_parameters[name]] if name in path_parameters else []
+            elif location == "query":
+                values = query.get(name, [])
+            elif location == "header":
+                values = [headers[name.lower()]] if name.lower() in headers else []
+            else:
+                continue
+
+            if not values:
+                if required:
+                    errors.append(f"missing required {location} parameter '{name}'")
+                continue
+            for value in values:
+                if not checker(value):
+                    errors.append(f"{location} parameter '{name}' must be {parameter_type}, got '{value}'")
+
+        if not check_body:
+            return errors
+
+        if body is None:
+            if self.body_required:
+                missing = [name for name, required, _, _ in self._body_rules or [] if required]
+                if missing:
+                    errors.append(f"request body is required, missing fields {', '.join(repr(name) for name in missing)}")
+                else:
+                    errors.append("request body is required")
+        elif self._body_rules is not None:
+            if not isinstance(body, dict):
+                errors.append(f"request body must be a JSON object, got {type(body).__name__}")
+            else:
+                for name, required, variable_type, checker in self._body_rules:
+                    if name not in body:
+                        if required:
+                            errors.append(f"missing required body field '{name}'")
+                    elif (body[name] is not None or required) and not checker(body[name]):
+                        # optional fields also accept null
+                        errors.append(f"body field '{name}' must be {variable_type}, got {type(body[name]).__name__}")
+        return errors
+
+
+class RequestValidator:
+    """
+    Validates outgoing calls against the spec before they are sent, so a bad
+    call costs a local check instead of a network round trip and a 4xx.
+
+    Only the route table is built up front; each operation's validator is
+    loaded and compiled by `load_operation` the first time a call hits it.
+    """
+
+    def __init__(self, routes: list[tuple[str, str, str]], load_operation: Callable[[str], OperationValidator]) -> None:
+        self._load_operation = load_operation
+        self._operations: dict[str, OperationValidator] = {}
+        self._routes = _RouteNode()
+        self._routes.pending = [("/".join(_split_path(path)), method.upper(), operation_id) for path, method, operation_id in routes]
+
+    @classmethod
+    def from_openapi_parts(cls, openapi_parts: OpenApiParts) -> "RequestValidator":
+        return cls.from_dict(cls.operation_dicts(openapi_parts))
+
+    @classmethod
+    def from_dict(cls, data: list[dict]) -> "RequestValidator":
+        operations = {}
+        for operation in data:
+            operations.setdefault(operation["operation_id"], operation)
+        return cls(
+            [(operation["path"], operation["method"], operation["operation_id"]) for operation in data],
+            lambda operation_id: OperationValidator(**operations[operation_id]),
+        )
+
+    @staticmethod
+    def operation_dicts(openapi_parts: OpenApiParts) -> list[dict]:
+        """
+        Plain-data description of every operation's checks, one dict per
+        operation, in the form `OperationValidator` takes as keyword arguments.
+        """
+        parameters = {}
+        for item in openapi_parts.parameter_definitions.content:
+            parameters.setdefault(item.operation_id, []).append({
+                "name": item.name,
+                "in": getattr(item, "in"),
+                "required": item.required,
+                "parameter_type": item.parameter_type,
+            })
+
+        schemas = {}
+        for item in openapi_parts.schema_definitions.content:
+            schemas.setdefault(item.schema_name, []).append({
+                "variable_name": item.variable_name,
+                "variable_type": item.variable_type,
+                "required": item.required,
+            })
+
+        body_refs = {}
+        body_required = set()
+        for item in openapi_parts.request_body_definitions.content:
+            if item.required:
+                body_required.add(item.operation_id)
+            if not item.schema_ref:
+                continue
+            if item.operation_id not in body_refs or item.content_type == "application/json":
+                body_refs[item.operation_id] = item.schema_ref
+
+        return [
+            {
+                "operation_id": item.operation_id,
+                "method": item.method,
+                "path": item.path,
+                "parameters": parameters.get(item.operation_id, []),
+                "body_fields": schemas.get(body_refs[item.operation_id], []) if item.operation_id in body_refs else None,
+                "body_required": item.operation_id in body_required,
+            }
+            for item in openapi_parts.method_definitions.content
+        ]
+
+    def operation(self, operation_id: str) -> OperationValidator:
+        if operation_id not in self._operations:
+            self._operations[operation_id] = self._load_operation(operation_id)
+        return self._operations[operation_id]
+
+    def validate(self, method: str, path: str, body: any = None, headers: dict | None = None, params: dict | None = None, check_body: bool = True) -> list[str]:
+        """
+        Returns a list of problems with the call, empty when it matches the spec.
+        `path` is relative to the base url and may carry a query string. Pass
+        `check_body=False` when a body is sent that isn't JSON, e.g. form data.
+        """
+        method = method.upper()
+        url = urlsplit(path)
+        path = url.path
+
+        if unfilled := _TEMPLATE_PARAMETER.findall(path):
+            return [f"path template parameter '{name}' was not filled in '{path}'" for name in unfilled]
+
+        found = self._routes.find(_split_path(path))
+        if found is None:
+            return [f"no endpoint matches {method} '{path}'"]
+
+        # the most specific matching path decides, even if the method is wrong
+        route, path_parameters = found
+        if method not in route:
+            return [f"method {method} is not allowed for '{path}', use one of {', '.join(sorted(route))}"]
+        operation = self.operation(route[method])
+
+        query = parse_qs(url.query, keep_blank_values=True)
+        for key, value in (params or {}).items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            query.setdefault(key, []).extend(str(v) for v in values)
+        errors = operation.validate(path_parameters, query, headers, body, check_body=check_body)
+        return [f"{operation.operation_id}: {error}" for error in errors]
@@ -0,0 +1,255 @@
+import heapq
+import itertools
+import logging
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Literal
+
+import openai
+
+logger = logging.getLogger(__name__)
+
+Priority = Literal["interactive", "batch"]
+
+PRIORITIES: dict[str, int] = {
+    "interactive": 0,
+    "batch": 1,
+}
+
+DEFAULT_REQUESTS_PER_MINUTE = 3500
+DEFAULT_TOKENS_PER_MINUTE = 90000
+
+
+def estimate_tokens(messages: list[dict]) -> int:
+    """
+    Rough prompt size for rate limiting: ~4 characters per token plus a few
+    tokens of framing per message.
+    """
+    return sum(len(message.get("content") or "") // 4 + 4 for message in messages) + 3
+
+
+class TokenBucket:
+    """
+    Refills at `per_minute` / 60 per second but only holds `burst_seconds` worth,
+    since providers enforce per-minute limits over much shorter windows.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = 3.0, clock: Callable[[], float] = time.monotonic) -> None:
+        self.rate = per_minute / 60
+        self.capacity = self.rate * burst_seconds
+        self.available = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def _refill(self, now: float):
+        self.available = min(self.capacity, self.available + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        Seconds until `amount` can be taken. Requests bigger than the whole
+        bucket only wait for a full bucket, otherwise they could never run.
+        """
+        self._refill(self.clock())
+        needed = min(amount, self.capacity)
+        if self.available >= needed:
+            return 0
+        return (needed - self.available) / self.rate
+
+    def consume(self, amount: float):
+        # may go negative, e.g. when a response used more tokens than estimated
+        self._refill(self.clock())
+        self.available -= amount
+
+
+@dataclass
+class QueueWaitStats:
+    count: int = 0
+    total: float = 0
+    max: float = 0
+
+    def add(self, wait: float):
+        self.count += 1
+        self.total += wait
+        self.max = max(self.max, wait)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+
+@dataclass
+class SchedulerMetrics:
+    requests: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    server_errors: int = 0
+    failures: int = 0
+    queue_wait: dict[str, QueueWaitStats] = field(default_factory=lambda: {p: QueueWaitStats() for p in PRIORITIES})
+
+    def to_dict(self) -> dict:
+        return {
+            "requests": self.requests,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "server_errors": self.server_errors,
+            "failures": self.failures,
+            "queue_wait": {
+                priority: {"count": stats.count, "mean": stats.mean, "max": stats.max}
+                for priority, stats in self.queue_wait.items()
+            },
+        }
+
+
+class RequestScheduler:
+    """
+    Central gate for LLM requests.
+
+    Every request waits for a slot in two token buckets, one for requests per
+    minute and one for tokens per minute, each holding only `burst_seconds`
+    worth of its limit. The token bucket is charged with the estimated prompt
+    size and corrected with the real usage once the response arrives. Waiting
+    requests are served by priority, so interactive sessions go before batch
+    ones. 429 and 5xx responses are retried with jittered exponential backoff;
+    a 429 also pauses the whole queue, since the limit is shared by the account.
+
+    The buckets only cover the current process; when several processes share
+    an account, give each one its share of the limits.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = DEFAULT_REQUESTS_PER_MINUTE,
+        tokens_per_minute: float = DEFAULT_TOKENS_PER_MINUTE,
+        max_retries: int = 5,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        burst_seconds: float = 3.0,
+        retry_exceptions: tuple[type[Exception], ...] = (openai.error.Timeout, openai.error.APIConnectionError),
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_exceptions = retry_exceptions
+        self.clock = clock
+        self.metrics = SchedulerMetrics()
+
+        self._request_bucket = TokenBucket(requests_per_minute, burst_seconds=burst_seconds, clock=clock)
+        self._token_bucket = TokenBucket(tokens_per_minute, burst_seconds=burst_seconds, clock=clock)
+        self._paused_until = 0
+        self._queue = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+
+    def submit(self, send: Callable[[], dict], estimated_tokens: int, priority: Priority = "interactive") -> dict:
+        if priority not in PRIORITIES:
+            raise ValueError(f"Priority '{priority}' is not supported.")
+
+        attempt = 0
+        while True:
+            self._acquire(estimated_tokens, priority)
+            try:
+                resp = send()
+            except Exception as e:
+                delay = self._retry_delay(e, attempt)
+                if delay is None or attempt >= self.max_retries:
+                    with self._condition:
+                        self.metrics.failures += 1
+                    raise
+                attempt += 1
+                with self._condition:
+                    self.metrics.retries += 1
+                logger.debug(f"Request failed with {e!r}, retry {attempt}/{self.max_retries} in {delay:.2f}s")
+                time.sleep(delay)
+                continue
+
+            usage = resp.get("usage") or {}
+            if "total_tokens" in usage:
+                with self._condition:
+                    self._token_bucket.consume(usage["total_tokens"] - estimated_tokens)
+            return resp
+
+    def _acquire(self, estimated_tokens: int, priority: Priority):
+        with self._condition:
+            ticket = (PRIORITIES[priority], next(self._counter))
+            heapq.heappush(self._queue, ticket)
+            # the new ticket may now be at the head of the queue
+            self._condition.notify_all()
+            enqueued = self.clock()
+
+            while True:
+                if self._queue[0] == ticket:
+                    wait = max(
+                        self._request_bucket.wait_time(1),
+                        self._token_bucket.wait_time(estimated_tokens),
+                        self._paused_until - self.clock(),
+                    )
+                    if wait <= 0:
+                        break
+                    self._condition.wait(wait)
+                else:
+                    self._condition.wait()
+
+            heapq.heappop(self._queue)
+            self._request_bucket.consume(1)
+            self._token_bucket.consume(estimated_tokens)
+            queue_wait = self.clock() - enqueued
+            self.metrics.requests += 1
+            self.metrics.queue_wait[priority].add(queue_wait)
+            self._condition.notify_all()
+
+        logger.debug(f"Queue wait ({priority}): {queue_wait:.3f}s")
+
+    def _retry_delay(self, exc: Exception, attempt: int) -> float | None:
+        """
+        Seconds to wait before retrying `exc`, or None when it should not be retried.
+        """
+        status = getattr(exc, "http_status", None)
+        if status == 429:
+            with self._condition:
+                self.metrics.rate_limited += 1
+        elif status is not None and status >= 500:
+            with self._condition:
+                self.metrics.server_errors += 1
+        elif not isinstance(exc, self.retry_exceptions):
+            return None
+
+        backoff = min(self.max_delay, self.base_delay * 2 ** attempt)
+        delay = backoff / 2 + random.uniform(0, backoff / 2)
+        retry_after = self._retry_after(exc)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+
+        if status == 429:
+            with self._condition:
+                self._paused_until = max(self._paused_until, self.clock() + delay)
+                self._condition.notify_all()
+        return delay
+
+    def _retry_after(self, exc: Exception) -> float | None:
+        headers = getattr(exc, "headers", None) or {}
+        try:
+            return float(headers.get("retry-after") or headers.get("Retry-After"))
+        except (TypeError, ValueError):
+            return None
+
+
+_default_scheduler: RequestScheduler | None = None
+_default_scheduler_lock = threading.Lock()
+
+
+def get_default_scheduler() -> RequestScheduler:
+    global _default_scheduler
+    with _default_scheduler_lock:
+        if _default_scheduler is None:
+            _default_scheduler = RequestScheduler()
+        return _default_scheduler
+
+
+def set_default_scheduler(scheduler: RequestScheduler):
+    global _default_scheduler
+    with _default_scheduler_lock:
+        _default_scheduler = scheduler
@@ -0,0 +1,204 @@
+import json
+import mmap
+import os
+import struct
+import tempfile
+
+from api_doc_gpt.openapi_parser import (
+    OpenApiMethodDefinition,
+    OpenApiParameterDefinition,
+    OpenApiParser,
+    OpenApiParts,
+    OpenApiSchemaDefinition,
+    OpenApiSecurityDefinition,
+)
+from api_doc_gpt.request_validator import OperationValidator, RequestValidator
+
+TABLE_NAMES = (
+    "method_definitions",
+    "parameter_definitions",
+    "request_body_definitions",
+    "schema_definitions",
+    "security_definitions",
+)
+
+# bump the version whenever the sections change, so stale indexes are rejected on attach
+_MAGIC = b"ADGSPEC4"
+# magic, length of the table of contents that follows the header
+_HEADER = struct.Struct("<8sQ")
+
+
+def _default_index_dir() -> str:
+    # /dev/shm keeps the file in RAM on Linux; elsewhere the page cache does the sharing
+    if os.path.isdir("/dev/shm"):
+        return "/dev/shm"
+    return tempfile.gettempdir()
+
+
+def _endpoint_details_to_dict(details: dict) -> dict:
+    request_body_schema = details["request_body_schema"]
+    return {
+        "endpoint_parameters": details["endpoint_parameters"] and details["endpoint_parameters"].to_dict(),
+        "request_body_schema": None if request_body_schema is None else [schema.to_dict() for schema in request_body_schema],
+        "endpoint_definition": details["endpoint_definition"].to_dict(),
+        "security_details": details["security_details"] and details["security_details"].to_dict(),
+    }
+
+
+def _endpoint_details_from_dict(data: dict) -> dict:
+    request_body_schema = data["request_body_schema"]
+    return {
+        "endpoint_parameters": data["endpoint_parameters"] and OpenApiParameterDefinition(**data["endpoint_parameters"]),
+        "request_body_schema": None if request_body_schema is None else [OpenApiSchemaDefinition(**d) for d in request_body_schema],
+        "endpoint_definition": OpenApiMethodDefinition(**data["endpoint_definition"]),
+        "security_details": data["security_details"] and OpenApiSecurityDefinition(**data["security_details"]),
+    }
+
+
+class SpecIndex:
+    """
+    Read-only, memory-mapped copy of a parsed OpenAPI spec.
+
+    A parent process calls `SpecIndex.build` once and passes `path` to its
+    workers. Workers call `SpecIndex.attach` and read the prompt tables,
+    per-endpoint details and request validators straight out of the shared
+    mapping, so none of them has to load, parse or keep its own copy of the spec.
+    """
+
+    def __init__(self, path: str, owner: bool = False) -> None:
+        self.path = path
+        self.owner = owner
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, toc_length = _HEADER.unpack_from(self._mmap, 0)
+        if magic != _MAGIC:
+            self._mmap.close()
+            if magic.startswith(_MAGIC[:-1]):
+                raise ValueError(f"{path} was built by a different version of api_doc_gpt, rebuild it with build_spec_index")
+            raise ValueError(f"{path} is not a spec index")
+        toc_start = _HEADER.size
+        self._data_start = toc_start + toc_length
+        self._toc = json.loads(self._mmap[toc_start:self._data_start])
+
+    @classmethod
+    def build(cls, openapi_json: dict, path: str | None = None, rate_limits: dict | None = None) -> "SpecIndex":
+        openapi_parts = OpenApiParser(openapi_json).parse()
+        sections = cls._build_sections(openapi_parts)
+        if rate_limits:
+            sections["rate_limits"] = json.dumps(rate_limits).encode("utf-8")
+
+        toc = {}
+        offset = 0
+        for key, value in sections.items():
+            toc[key] = [offset, len(value)]
+            offset += len(value)
+        toc_bytes = json.dumps(toc).encode("utf-8")
+
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix="api-doc-gpt-", suffix=".spec", dir=_default_index_dir())
+            os.close(fd)
+        # write next to the target and rename, so workers never see a half-written index
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, len(toc_bytes)))
+            f.write(toc_bytes)
+            for value in sections.values():
+                f.write(value)
+        os.replace(tmp_path, path)
+        return cls(path, owner=True)
+
+    @classmethod
+    def attach(cls, path: str) -> "SpecIndex":
+        return cls(path)
+
+    @staticmethod
+    def _build_sections(openapi_parts: OpenApiParts) -> dict[str, bytes]:
+        sections = {}
+        for table_name in TABLE_NAMES:
+            sections[f"table/{table_name}"] = getattr(openapi_parts, table_name).to_csv().encode("utf-8")
+
+        # one section per operation, so workers only decode the validators they use
+        routes = []
+        for operation in RequestValidator.operation_dicts(openapi_parts):
+            routes.append([operation["path"], operation["method"], operation["operation_id"]])
+            key = f"validator/{operation['operation_id']}"
+            if key not in sections:
+                sections[key] = json.dumps(operation).encode("utf-8")
+        sections["routes"] = json.dumps(routes).encode("utf-8")
+
+        # same lookups as `get_endpoint_details`, grouped up front so the build stays linear
+        first_parameters = {}
+        for item in openapi_parts.parameter_definitions.content:
+            first_parameters.setdefault(item.operation_id, item)
+        first_request_bodies = {}
+        for item in openapi_parts.request_body_definitions.content:
+            first_request_bodies.setdefault(item.operation_id, item)
+        securities = {}
+        for item in openapi_parts.security_definitions.content:
+            securities.setdefault(item.security_name, item)
+        schemas = {}
+        for item in openapi_parts.schema_definitions.content:
+            schemas.setdefault(item.schema_name, []).append(item)
+
+        for method_definition in openapi_parts.method_definitions.content:
+            operation_id = method_definition.operation_id
+            key = f"endpoint/{operation_id}"
+            if key in sections:
+                continue
+            request_body_part = first_request_bodies.get(operation_id)
+            details = {
+                "endpoint_parameters": first_parameters.get(operation_id),
+                "request_body_schema": schemas.get(request_body_part.schema_ref, []) if request_body_part else None,
+                "endpoint_definition": method_definition,
+                "security_details": securities.get(method_definition.security),
+            }
+            sections[key] = json.dumps(_endpoint_details_to_dict(details)).encode("utf-8")
+        return sections
+
+    def _read(self, key: str) -> str | None:
+        if key not in self._toc:
+            return None
+        offset, length = self._toc[key]
+        start = self._data_start + offset
+        return self._mmap[start:start + length].decode("utf-8")
+
+    def table_csv(self, table_name: str) -> str:
+        if table_name not in TABLE_NAMES:
+            raise KeyError(table_name)
+        return self._read(f"table/{table_name}")
+
+    def endpoint_details(self, endpoint_id: str) -> dict:
+        data = self._read(f"endpoint/{endpoint_id}")
+        if data is None:
+            raise ValueError(f"Endpoint {endpoint_id} not found")
+        return _endpoint_details_from_dict(json.loads(data))
+
+    def rate_limits(self) -> dict | None:
+        """
+        Per-worker `requests_per_minute` and `tokens_per_minute` set by the parent, if any.
+        """
+        data = self._read("rate_limits")
+        return json.loads(data) if data else None
+
+    def request_validator(self) -> RequestValidator:
+        data = self._read("routes")
+        if data is None:
+            raise ValueError(f"{self.path} has no request validators, rebuild it with build_spec_index")
+        return RequestValidator(json.loads(data), self._load_operation_validator)
+
+    def _load_operation_validator(self, operation_id: str) -> OperationValidator:
+        return OperationValidator(**json.loads(self._read(f"validator/{operation_id}")))
+
+    def close(self) -> None:
+        self._mmap.close()
+
+    def unlink(self) -> None:
+        os.remove(self.path)
+
+    def __enter__(self) -> "SpecIndex":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+        if self.owner:
+            self.unlink()
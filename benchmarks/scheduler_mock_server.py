@@ -0,0 +1,154 @@
+"""
+Run `Chat` sessions through the request scheduler against a local mock of the
+chat completions API that enforces its own rate limit.
+
+The mock answers 429 (with Retry-After) once more than `--server-rps` requests
+arrive within a second and fails every `--error-every`-th accepted request
+with 503. The scheduler is deliberately configured above the server limit, so
+the run exercises retries and the queue pause. tests/test_scheduler.py runs
+the same setup with assertions.
+
+    python benchmarks/scheduler_mock_server.py --sessions 6 --turns 5
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import openai
+
+from api_doc_gpt.chat import Chat
+from api_doc_gpt.scheduler import RequestScheduler
+
+
+class MockChatCompletionsHandler(BaseHTTPRequestHandler):
+    server_rps: int = 5
+    error_every: int = 20
+    lock = threading.Lock()
+    recent: deque = deque()
+    accepted: int = 0
+    status_counts: dict = {}
+
+    @classmethod
+    def reset(cls, server_rps: int = 5, error_every: int = 20):
+        cls.server_rps = server_rps
+        cls.error_every = error_every
+        cls.recent = deque()
+        cls.accepted = 0
+        cls.status_counts = {}
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: dict, headers: dict | None = None):
+        with self.lock:
+            self.status_counts[status] = self.status_counts.get(status, 0) + 1
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length))
+
+        now = time.monotonic()
+        with self.lock:
+            while self.recent and now - self.recent[0] > 1:
+                self.recent.popleft()
+            limited = len(self.recent) >= self.server_rps
+            if not limited:
+                self.recent.append(now)
+                type(self).accepted += 1
+            failed = not limited and self.accepted % self.error_every == 0
+        if limited:
+            return self._reply(429, {"error": {"message": "Rate limit reached", "type": "requests"}}, {"Retry-After": "1"})
+        if failed:
+            return self._reply(503, {"error": {"message": "Service unavailable", "type": "server_error"}})
+
+        prompt_tokens = sum(len(m["content"]) // 4 + 4 for m in request["messages"])
+        self._reply(200, {
+            "id": "chatcmpl-mock",
+            "object": "chat.completion",
+            "model": request["model"],
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": "OUT: ok"}, "finish_reason": "stop"}],
+            "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": 3, "total_tokens": prompt_tokens + 3},
+        })
+
+
+def run_session(chat: Chat, turns: int, errors: list):
+    for i in range(turns):
+        try:
+            chat.user_message(f"PROMPT: question {i}")
+        except Exception as e:
+            errors.append(e)
+
+
+def start_mock_server() -> ThreadingHTTPServer:
+    """
+    Starts the mock in a background thread. Point `openai.api_base` at
+    `mock_api_base(server)` to use it.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockChatCompletionsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def mock_api_base(server: ThreadingHTTPServer) -> str:
+    return f"http://127.0.0.1:{server.server_port}/v1"
+
+
+def run_sessions(scheduler: RequestScheduler, sessions: int, turns: int) -> list[Exception]:
+    errors = []
+    threads = []
+    for i in range(sessions):
+        priority = "batch" if i < sessions // 2 else "interactive"
+        chat = Chat(
+            starting_state=[{"role": "system", "content": "You are a helpful AI assistant"}],
+            priority=priority,
+            scheduler=scheduler,
+        )
+        threads.append(threading.Thread(target=run_session, args=(chat, turns, errors)))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return errors
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--sessions", type=int, default=6)
+    arg_parser.add_argument("--turns", type=int, default=5)
+    arg_parser.add_argument("--server-rps", type=int, default=5)
+    arg_parser.add_argument("--error-every", type=int, default=20)
+    arg_parser.add_argument("--scheduler-rpm", type=int, default=600)
+    args = arg_parser.parse_args()
+
+    MockChatCompletionsHandler.reset(server_rps=args.server_rps, error_every=args.error_every)
+    server = start_mock_server()
+    openai.api_key = "mock"
+    openai.api_base = mock_api_base(server)
+    scheduler = RequestScheduler(requests_per_minute=args.scheduler_rpm, tokens_per_minute=1_000_000, base_delay=0.2, max_delay=5)
+
+    start = time.monotonic()
+    errors = run_sessions(scheduler, args.sessions, args.turns)
+    server.shutdown()
+
+    print(f"finished in {time.monotonic() - start:.1f}s, failed turns: {len(errors)}")
+    print(f"server responses: {dict(sorted(MockChatCompletionsHandler.status_counts.items()))}")
+    print(json.dumps(scheduler.metrics.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Compare worker startup time and RSS with and without a shared spec index.
+
+Every worker either loads and parses the spec on its own (what each process
+did before `SpecIndex`), or attaches to an index built once by the parent.
+Both modes do what `ApiMasterAI.start` does: render the prompt tables and set
+up the request validator, then validate one call. The example spec is
+replicated `--copies` times to emulate a large API.
+
+    python benchmarks/spec_index_workers.py --workers 8 --copies 200
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from api_doc_gpt.openapi_parser import OpenApiParser
+from api_doc_gpt.request_validator import RequestValidator
+from api_doc_gpt.spec_index import SpecIndex, TABLE_NAMES
+
+
+def make_large_spec(openapi_json: dict, copies: int) -> dict:
+    paths = {}
+    for i in range(copies):
+        for path, path_item in openapi_json["paths"].items():
+            path_item = json.loads(json.dumps(path_item))
+            for operation in path_item.values():
+                operation["operationId"] = f"{operation['operationId']}_{i}"
+            paths[f"/v{i}{path}"] = path_item
+    return {**openapi_json, "paths": paths}
+
+
+def rss_kb() -> int:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1])
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+
+def parse_worker(spec_path: str) -> tuple[float, int, int]:
+    start = time.perf_counter()
+    with open(spec_path) as f:
+        openapi_json = json.load(f)
+    openapi_parts = OpenApiParser(openapi_json).parse()
+    tables = {name: getattr(openapi_parts, name).to_csv() for name in TABLE_NAMES}
+    RequestValidator.from_openapi_parts(openapi_parts).validate("GET", "/v0/pet/1")
+    elapsed = time.perf_counter() - start
+    return elapsed, rss_kb(), sum(len(t) for t in tables.values())
+
+
+def index_worker(index_path: str) -> tuple[float, int, int]:
+    start = time.perf_counter()
+    spec_index = SpecIndex.attach(index_path)
+    tables = {name: spec_index.table_csv(name) for name in TABLE_NAMES}
+    spec_index.request_validator().validate("GET", "/v0/pet/1")
+    elapsed = time.perf_counter() - start
+    return elapsed, rss_kb(), sum(len(t) for t in tables.values())
+
+
+def report(label: str, results: list[tuple[float, int, int]]):
+    startup = sorted(r[0] * 1000 for r in results)
+    rss = sorted(r[1] / 1024 for r in results)
+    print(f"{label:>7}: startup median {startup[len(startup) // 2]:.1f} ms, RSS median {rss[len(rss) // 2]:.1f} MiB per worker")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument("--spec", default=os.path.join(os.path.dirname(__file__), "..", "example", "openapi.json"))
+    arg_parser.add_argument("--workers", type=int, default=4)
+    arg_parser.add_argument("--copies", type=int, default=200)
+    args = arg_parser.parse_args()
+
+    with open(args.spec) as f:
+        openapi_json = make_large_spec(json.load(f), args.copies)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        spec_path = os.path.join(tmp_dir, "openapi.json")
+        with open(spec_path, "w") as f:
+            json.dump(openapi_json, f)
+        print(f"spec: {len(openapi_json['paths'])} paths, {os.path.getsize(spec_path) / 1024:.0f} KiB")
+
+        ctx = multiprocessing.get_context("spawn")
+        with ctx.Pool(args.workers) as pool:
+            report("parse", pool.map(parse_worker, [spec_path] * args.workers))
+
+        start = time.perf_counter()
+        with SpecIndex.build(openapi_json) as spec_index:
+            print(f"index built once in {(time.perf_counter() - start) * 1000:.1f} ms")
+            with ctx.Pool(args.workers) as pool:
+                report("attach", pool.map(index_worker, [spec_index.path] * args.workers))
+
+
+if __name__ == "__main__":
+    main()
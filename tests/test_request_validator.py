@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from api_doc_gpt.openapi_parser import OpenApiParser
+from api_doc_gpt.request_validator import RequestValidator
+from api_doc_gpt.react.tools import RequestTool
+
+
+@pytest.fixture(scope="module")
+def validator() -> RequestValidator:
+    with open("example/openapi.json") as f:
+        return RequestValidator.from_openapi_parts(OpenApiParser(json.load(f)).parse())
+
+
+def test_valid_calls_pass(validator):
+    assert validator.validate("GET", "/pet/1") == []
+    assert validator.validate("GET", "/pet/findByStatus?status=sold") == []
+    assert validator.validate("POST", "/pet", {"name": "rex", "photoUrls": []}) == []
+    assert validator.validate("GET", "/pet/findByTags", params={"tags": ["a", "b"]}) == []
+
+
+def test_unfilled_path_template(validator):
+    assert validator.validate("GET", "/pet/{petId}") == ["path template parameter 'petId' was not filled in '/pet/{petId}'"]
+
+
+def test_wrong_parameter_and_body_types(validator):
+    assert validator.validate("GET", "/pet/abc") == ["getPetById: path parameter 'petId' must be integer, got 'abc'"]
+    assert validator.validate("POST", "/pet", {"name": 1}) == [
+        "addPet: body field 'name' must be string, got int",
+        "addPet: missing required body field 'photoUrls'",
+    ]
+
+
+def test_missing_body_reports_required_fields(validator):
+    assert validator.validate("POST", "/pet") == ["addPet: request body is required, missing fields 'name', 'photoUrls'"]
+    # requestBody.required is not set, so leaving the body out is fine
+    assert validator.validate("POST", "/store/order") == []
+
+
+def test_optional_body_with_required_fields_can_be_left_out():
+    openapi_json = {
+        "paths": {
+            "/items": {
+                "post": {
+                    "operationId": "createItem",
+                    "requestBody": {"required": False, "content": {"application/json": {"schema": {"$ref": "#/components/schemas/Item"}}}},
+                    "responses": {"200": {}},
+                },
+            },
+        },
+        "components": {
+            "schemas": {
+                "Item": {"required": ["name"], "properties": {"name": {"type": "string"}, "n": {"type": "integer"}}},
+            },
+        },
+    }
+    validator = RequestValidator.from_openapi_parts(OpenApiParser(openapi_json).parse())
+    assert validator.validate("POST", "/items") == []
+    assert validator.validate("POST", "/items", {"name": "a", "n": None}) == []
+    assert validator.validate("POST", "/items", {"name": None}) == ["createItem: body field 'name' must be string, got NoneType"]
+
+
+def test_wrong_method_on_literal_path_does_not_fall_through_to_template(validator):
+    assert validator.validate("POST", "/pet/findByStatus") == ["method POST is not allowed for '/pet/findByStatus', use one of GET"]
+    assert validator.validate("PATCH", "/pet") == ["method PATCH is not allowed for '/pet', use one of POST, PUT"]
+
+
+def test_unknown_path(validator):
+    assert validator.validate("GET", "/nope") == ["no endpoint matches GET '/nope'"]
+
+
+def test_request_tool_rejects_call_without_body(validator):
+    tool = RequestTool(validator=validator, base_url="http://localhost:8000/api/v3")
+    with pytest.raises(ValueError, match="request body is required"):
+        tool({"method": "POST", "url": "http://localhost:8000/api/v3/pet"})
+
+
+def test_request_tool_skips_body_checks_for_non_json_bodies(validator):
+    tool = RequestTool(validator=validator, base_url="http://localhost:8000/api/v3")
+    url = "http://localhost:8000/api/v3/pet"
+    for body in [{"data": {"name": "rex"}}, {"data": "name=rex"}, {"files": {"file": b"x"}}]:
+        tool.validate({"method": "POST", "url": url, **body})
+    # parameter checks still run
+    with pytest.raises(ValueError, match="must be integer"):
+        tool.validate({"method": "POST", "url": url + "/abc", "data": {"name": "rex"}})
+
+
+def test_routes_with_partial_segment_templates():
+    openapi_json = {
+        "paths": {
+            "/files/{name}.json": {"get": {"operationId": "getJson", "responses": {"200": {}}}},
+            "/files/{name}": {"get": {"operationId": "getFile", "responses": {"200": {}}}},
+            "/files/latest": {"get": {"operationId": "getLatest", "responses": {"200": {}}}},
+        },
+    }
+    validator = RequestValidator.from_openapi_parts(OpenApiParser(openapi_json).parse())
+    assert validator.validate("GET", "/files/a.json") == []
+    assert validator.validate("GET", "/files/latest/") == []
+    assert validator.validate("DELETE", "/files/latest") == ["method DELETE is not allowed for '/files/latest', use one of GET"]
+    assert validator.validate("GET", "/files/a/b") == ["no endpoint matches GET '/files/a/b'"]
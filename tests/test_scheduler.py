@@ -0,0 +1,70 @@
+import threading
+import time
+
+import openai
+import pytest
+
+from api_doc_gpt.scheduler import RequestScheduler
+from benchmarks.scheduler_mock_server import MockChatCompletionsHandler, mock_api_base, run_sessions, start_mock_server
+
+
+@pytest.fixture
+def mock_server(monkeypatch):
+    MockChatCompletionsHandler.reset(server_rps=5, error_every=7)
+    server = start_mock_server()
+    monkeypatch.setattr(openai, "api_key", "mock")
+    monkeypatch.setattr(openai, "api_base", mock_api_base(server))
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_retries_rate_limits_and_server_errors_until_success(mock_server):
+    # bursts of 20 requests against a server that accepts 5 per second
+    scheduler = RequestScheduler(requests_per_minute=600, tokens_per_minute=1_000_000, burst_seconds=2, base_delay=0.1, max_delay=1)
+    errors = run_sessions(scheduler, sessions=6, turns=3)
+
+    metrics = scheduler.metrics
+    assert errors == []
+    assert metrics.failures == 0
+    assert metrics.rate_limited > 0
+    assert metrics.server_errors > 0
+    assert metrics.retries == metrics.rate_limited + metrics.server_errors
+    assert MockChatCompletionsHandler.status_counts[200] == 18
+
+
+def test_interactive_requests_are_dispatched_before_batch_when_bucket_is_exhausted():
+    now = [0.0]
+    # one request fits in the bucket, and it only refills when the test moves the clock
+    scheduler = RequestScheduler(requests_per_minute=60, tokens_per_minute=1_000_000, burst_seconds=1, clock=lambda: now[0])
+    dispatched = []
+
+    def submit(name: str, priority: str):
+        scheduler.submit(lambda: dispatched.append(name) or {}, estimated_tokens=1, priority=priority)
+
+    submit("warmup", "interactive")
+
+    threads = []
+    for i in range(3):
+        threads.append(threading.Thread(target=submit, args=(f"batch-{i}", "batch")))
+        threads[-1].start()
+    while len(scheduler._queue) < 3:
+        time.sleep(0.001)
+    for i in range(3):
+        threads.append(threading.Thread(target=submit, args=(f"interactive-{i}", "interactive")))
+        threads[-1].start()
+    while len(scheduler._queue) < 6:
+        time.sleep(0.001)
+
+    while any(thread.is_alive() for thread in threads):
+        now[0] += 1
+        time.sleep(0.02)
+    for thread in threads:
+        thread.join()
+
+    assert dispatched == [
+        "warmup",
+        "interactive-0", "interactive-1", "interactive-2",
+        "batch-0", "batch-1", "batch-2",
+    ]
+    assert scheduler.metrics.queue_wait["interactive"].max < scheduler.metrics.queue_wait["batch"].max
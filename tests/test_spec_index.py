@@ -0,0 +1,55 @@
+import json
+
+import pytest
+
+from api_doc_gpt.openapi_parser import OpenApiParser, get_endpoint_details
+from api_doc_gpt.spec_index import TABLE_NAMES, SpecIndex
+
+
+@pytest.fixture(scope="module")
+def openapi_json() -> dict:
+    with open("example/openapi.json") as f:
+        return json.load(f)
+
+
+def test_attached_index_matches_parser(openapi_json, tmp_path):
+    openapi_parts = OpenApiParser(openapi_json).parse()
+    with SpecIndex.build(openapi_json, path=str(tmp_path / "spec")) as spec_index:
+        attached = SpecIndex.attach(spec_index.path)
+        for table_name in TABLE_NAMES:
+            assert attached.table_csv(table_name) == getattr(openapi_parts, table_name).to_csv()
+        for method_definition in openapi_parts.method_definitions.content:
+            operation_id = method_definition.operation_id
+            assert str(attached.endpoint_details(operation_id)) == str(get_endpoint_details(openapi_parts, operation_id))
+        assert attached.request_validator().validate("GET", "/pet/1") == []
+        attached.close()
+    assert not (tmp_path / "spec").exists()
+
+
+def test_index_from_another_version_is_rejected(openapi_json, tmp_path):
+    path = tmp_path / "spec"
+    with SpecIndex.build(openapi_json, path=str(path)) as spec_index:
+        data = bytearray(path.read_bytes())
+        data[7:8] = b"1"
+        stale = tmp_path / "stale"
+        stale.write_bytes(bytes(data))
+        with pytest.raises(ValueError, match="different version"):
+            SpecIndex.attach(str(stale))
+
+
+def test_parent_passes_rate_limits_to_workers(openapi_json, tmp_path):
+    rate_limits = {"requests_per_minute": 875, "tokens_per_minute": 22500}
+    with SpecIndex.build(openapi_json, path=str(tmp_path / "spec"), rate_limits=rate_limits) as spec_index:
+        attached = SpecIndex.attach(spec_index.path)
+        assert attached.rate_limits() == rate_limits
+        attached.close()
+
+
+def test_attached_validators_are_loaded_on_first_use(openapi_json, tmp_path):
+    with SpecIndex.build(openapi_json, path=str(tmp_path / "spec")) as spec_index:
+        attached = SpecIndex.attach(spec_index.path)
+        validator = attached.request_validator()
+        assert validator._operations == {}
+        assert validator.validate("GET", "/pet/abc") == ["getPetById: path parameter 'petId' must be integer, got 'abc'"]
+        assert list(validator._operations) == ["getPetById"]
+        attached.close()